@@ -1,16 +1,31 @@
 import asyncio
 import re
 import logging
+import threading
+import os
+import sys
+import json
+import math
+import signal
+import socket
+import ipaddress
+import sqlite3
+import uuid
+import contextvars
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from urllib.parse import urlparse, parse_qs, urlunparse, unquote
-from typing import Optional, List, Dict, Tuple
-import requests
-from bs4 import BeautifulSoup
+from typing import Optional, List, Dict, Tuple, Callable, Awaitable
+from collections import OrderedDict, Counter
 from telegram import Update, Message
-from telegram.ext import Application, MessageHandler, filters, ContextTypes
+from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 from telegram.constants import ParseMode, ChatType
 import time
 import random
-from fake_useragent import UserAgent
+
+# requests, bs4 and fake_useragent are imported lazily (see Warmup) so the
+# Telegram connection comes up without waiting for them to load
+PROCESS_START = time.monotonic()
 
 # Configure logging
 logging.basicConfig(
@@ -19,6 +34,571 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class UserAgentPool:
+    """Pre-built pool of browser user agents shared by all requests"""
+
+    POOL_SIZE = 50
+
+    # Used when fake_useragent data cannot be loaded
+    FALLBACK_AGENTS = [
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15',
+        'Mozilla/5.0 (Linux; Android 13; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36'
+    ]
+
+    _pool: List[str] = []
+    _lock = threading.Lock()
+
+    @staticmethod
+    def build(size: Optional[int] = None) -> None:
+        """Load fake_useragent data once and sample a pool of user agents"""
+        with UserAgentPool._lock:
+            if UserAgentPool._pool:
+                return
+            try:
+                from fake_useragent import UserAgent
+                ua = UserAgent()
+                pool = [ua.random for _ in range(size or UserAgentPool.POOL_SIZE)]
+            except Exception as e:
+                logger.warning(f"Failed to load user agents, using fallback list: {e}")
+                pool = list(UserAgentPool.FALLBACK_AGENTS)
+            UserAgentPool._pool = pool
+
+    @staticmethod
+    def random() -> str:
+        """Return a random user agent, building the pool on first use"""
+        if not UserAgentPool._pool:
+            UserAgentPool.build()
+        return random.choice(UserAgentPool._pool)
+
+class DNSCache:
+    """Async host resolution with a TTL-respecting in-process cache
+    
+    Queries go through aiodns (c-ares on the event loop, record TTLs are
+    honoured). Only if aiodns cannot be imported does it fall back to the
+    event loop's getaddrinfo with DEFAULT_TTL. Worker threads read the same
+    cache through the urllib3 connection hook installed by install().
+    """
+    
+    DEFAULT_TTL = 300.0
+    MIN_TTL = 30.0
+    
+    _entries: Dict[str, Tuple[float, List[Tuple[int, str]]]] = {}
+    _lock = threading.Lock()
+    _resolver = None
+    _installed = False
+    
+    @staticmethod
+    def lookup(host: str) -> Optional[List[Tuple[int, str]]]:
+        """Return fresh cached (family, ip) pairs for host, or None"""
+        with DNSCache._lock:
+            entry = DNSCache._entries.get(host)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+    
+    @staticmethod
+    def store(host: str, addresses: List[Tuple[int, str]], ttl: float):
+        with DNSCache._lock:
+            DNSCache._entries[host] = (time.monotonic() + max(ttl, DNSCache.MIN_TTL), addresses)
+    
+    @staticmethod
+    def clear():
+        """Forget all cached lookups"""
+        with DNSCache._lock:
+            DNSCache._entries.clear()
+    
+    @staticmethod
+    def is_ip(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host)
+            return True
+        except ValueError:
+            return False
+    
+    @staticmethod
+    async def resolve(host: Optional[str]) -> List[Tuple[int, str]]:
+        """Resolve host without blocking the event loop, served from cache when fresh"""
+        if not host or DNSCache.is_ip(host):
+            return []
+        cached = DNSCache.lookup(host)
+        if cached:
+            return cached
+        
+        try:
+            with RequestTrace.stage('dns'):
+                addresses, ttl = await DNSCache.query(host)
+        except OSError as e:
+            # Best effort: the worker thread resolves again through resolve_sync
+            logger.debug(f"DNS pre-resolve failed for {host}: {e}")
+            return []
+        if addresses:
+            DNSCache.store(host, addresses, ttl)
+        return addresses
+    
+    @staticmethod
+    async def query(host: str) -> Tuple[List[Tuple[int, str]], float]:
+        """Query DNS, returns (addresses, ttl)"""
+        if DNSCache._resolver is None:
+            try:
+                import aiodns
+                DNSCache._resolver = aiodns.DNSResolver()
+            except ImportError:
+                logger.warning("aiodns not installed, resolving with the event loop's getaddrinfo")
+                DNSCache._resolver = False
+        
+        if DNSCache._resolver:
+            import aiodns
+            import pycares
+            try:
+                result = await DNSCache._resolver.query_dns(host, 'A')
+                # The answer section also carries any CNAME records of the chain
+                records = [record for record in result.answer if isinstance(record.data, pycares.ARecordData)]
+            except aiodns.error.DNSError as e:
+                logger.debug(f"c-ares lookup failed for {host}: {e}")
+                records = []
+            if records:
+                ttl = min(record.ttl for record in records)
+                return [(socket.AF_INET, record.data.addr) for record in records], ttl
+            # c-ares skips /etc/hosts and only asked for A records; let the system resolver try
+        
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        return DNSCache.unique_addresses(infos), DNSCache.DEFAULT_TTL
+    
+    @staticmethod
+    def resolve_sync(host: str) -> List[Tuple[int, str]]:
+        """Blocking lookup for worker threads, e.g. redirect hops not resolved up front"""
+        cached = DNSCache.lookup(host)
+        if cached:
+            return cached
+        with RequestTrace.stage('dns'):
+            infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        addresses = DNSCache.unique_addresses(infos)
+        DNSCache.store(host, addresses, DNSCache.DEFAULT_TTL)
+        return addresses
+    
+    @staticmethod
+    def unique_addresses(infos) -> List[Tuple[int, str]]:
+        addresses = []
+        for family, _, _, _, sockaddr in infos:
+            if (family, sockaddr[0]) not in addresses:
+                addresses.append((family, sockaddr[0]))
+        return addresses
+    
+    @staticmethod
+    def install():
+        """Route urllib3 (and so requests) connections through the cache"""
+        if DNSCache._installed:
+            return
+        from urllib3.util import connection
+        original = connection.create_connection
+        
+        def create_connection(address, *args, **kwargs):
+            host, port = address
+            host = host.strip('[]')
+            if DNSCache.is_ip(host):
+                return original(address, *args, **kwargs)
+            
+            last_error: Optional[OSError] = None
+            for _, ip in DNSCache.resolve_sync(host):
+                start = time.perf_counter()
+                try:
+                    return original((ip, port), *args, **kwargs)
+                except OSError as e:
+                    last_error = e
+                finally:
+                    RequestTrace.record('connect', time.perf_counter() - start)
+            raise last_error or OSError(f"No addresses for {host}")
+        
+        connection.create_connection = create_connection
+        DNSCache._installed = True
+
+class HTTPClient:
+    """Shared keep-alive connection pools reused across all scrapes"""
+
+    POOL_CONNECTIONS = 20
+    POOL_MAXSIZE = 20
+
+    # Retailers we connect to ahead of the first message
+    PREWARM_URLS = [
+        'https://www.amazon.in/', 'https://www.flipkart.com/',
+        'https://www.meesho.com/', 'https://www.myntra.com/',
+        'https://www.ajio.com/'
+    ]
+
+    # Keep connections open to this many of the most-seen destination hosts
+    TOP_HOSTS = int(os.getenv('KEEPALIVE_TOP_HOSTS', '8'))
+    KEEPALIVE_INTERVAL = 60.0
+
+    _adapter = None
+    _lock = threading.Lock()
+    host_counts: Counter = Counter()
+
+    @staticmethod
+    def get_adapter():
+        """Return the process-wide HTTP adapter holding the connection pools"""
+        if HTTPClient._adapter is None:
+            with HTTPClient._lock:
+                if HTTPClient._adapter is None:
+                    from requests.adapters import HTTPAdapter
+                    DNSCache.install()
+                    HTTPClient._adapter = HTTPAdapter(
+                        pool_connections=HTTPClient.POOL_CONNECTIONS,
+                        pool_maxsize=HTTPClient.POOL_MAXSIZE
+                    )
+        return HTTPClient._adapter
+
+    @staticmethod
+    def new_session(max_redirects: Optional[int] = None):
+        """Create a session with its own cookies but the shared connection pools"""
+        import requests
+        session = requests.Session()
+        adapter = HTTPClient.get_adapter()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if max_redirects is not None:
+            session.max_redirects = max_redirects
+        return session
+
+    @staticmethod
+    def prewarm(urls: Optional[List[str]] = None, timeout: float = 3) -> int:
+        """Open keep-alive connections to retailers, returns number reached"""
+        session = HTTPClient.new_session()
+        reached = 0
+        for url in urls or HTTPClient.PREWARM_URLS:
+            try:
+                session.head(url, headers={'User-Agent': UserAgentPool.random()},
+                             timeout=timeout, allow_redirects=False, verify=False)
+                reached += 1
+            except Exception as e:
+                logger.debug(f"Prewarm failed for {url}: {e}")
+        return reached
+
+    @staticmethod
+    def note_host(url: str):
+        """Count a destination host towards the keep-alive top list"""
+        host = urlparse(url).hostname
+        if host:
+            HTTPClient.host_counts[host] += 1
+
+    @staticmethod
+    async def keep_warm():
+        """Periodically refresh DNS and keep-alive connections for the top hosts"""
+        while True:
+            await asyncio.sleep(HTTPClient.KEEPALIVE_INTERVAL)
+            hosts = [host for host, _ in HTTPClient.host_counts.most_common(HTTPClient.TOP_HOSTS)]
+            if not hosts:
+                continue
+            for host in hosts:
+                await DNSCache.resolve(host)
+            await asyncio.to_thread(HTTPClient.prewarm, [f"https://{host}/" for host in hosts])
+
+class CacheBackend(ABC):
+    """Shared key/value store and lock service used by several bot instances
+    
+    Methods are blocking; TTLCache calls them through asyncio.to_thread.
+    """
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return an unexpired value or None"""
+    
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: float):
+        """Store a value for ttl seconds"""
+    
+    @abstractmethod
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        """Take a cross-instance lock, False if another owner holds it"""
+    
+    @abstractmethod
+    def release(self, key: str, owner: str):
+        """Release a lock, only if still held by owner"""
+    
+    @staticmethod
+    def from_url(url: str) -> Optional['CacheBackend']:
+        """Create a backend from sqlite:///path/to/cache.db or redis://host:port/db"""
+        if not url:
+            return None
+        scheme = urlparse(url).scheme
+        if scheme == 'sqlite':
+            return SQLiteCacheBackend(url[len('sqlite:///'):])
+        if scheme in ('redis', 'rediss'):
+            return RedisCacheBackend(url)
+        raise ValueError(f"Unsupported shared cache URL: {url}")
+
+class SQLiteCacheBackend(CacheBackend):
+    """Shared cache in a local SQLite file, for instances on the same host"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)'
+        )
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value FROM cache WHERE key = ? AND expires_at > ?', (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+    
+    def set(self, key: str, value: str, ttl: float):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, value, now + ttl)
+            )
+            # Cheap housekeeping so the file does not grow forever
+            if random.random() < 0.01:
+                self._conn.execute('DELETE FROM cache WHERE expires_at <= ?', (now,))
+    
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute('DELETE FROM locks WHERE key = ? AND expires_at <= ?', (key, now))
+                cursor = self._conn.execute(
+                    'INSERT OR IGNORE INTO locks (key, owner, expires_at) VALUES (?, ?, ?)',
+                    (key, owner, now + ttl)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return cursor.rowcount == 1
+    
+    def release(self, key: str, owner: str):
+        with self._lock:
+            self._conn.execute('DELETE FROM locks WHERE key = ? AND owner = ?', (key, owner))
+
+class RedisCacheBackend(CacheBackend):
+    """Shared cache on a Redis-protocol server, for instances on separate hosts"""
+    
+    # Delete the lock only if we still own it
+    RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+    
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("The redis package is required for a redis:// shared cache") from e
+        self.client = redis.Redis.from_url(url, socket_timeout=2, socket_connect_timeout=2)
+    
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(key)
+        return value.decode('utf-8') if value is not None else None
+    
+    def set(self, key: str, value: str, ttl: float):
+        self.client.set(key, value, px=int(ttl * 1000))
+    
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        return bool(self.client.set(key, owner, nx=True, px=int(ttl * 1000)))
+    
+    def release(self, key: str, owner: str):
+        self.client.eval(self.RELEASE_SCRIPT, 1, key, owner)
+
+class TTLCache:
+    """In-memory LRU cache with expiry and in-flight request sharing
+    
+    Caches with a namespace also read through to the shared backend, if one
+    is configured, and take a cross-instance lock so only one instance
+    fetches a given key at a time.
+    """
+    
+    # Shared by all namespaced caches, see CacheBackend.from_url
+    shared: Optional[CacheBackend] = None
+    LOCK_TTL = 30.0
+    LOCK_WAIT = 15.0
+    LOCK_POLL_INTERVAL = 0.25
+    # After a backend error, skip the shared cache for this long
+    SHARED_RETRY_AFTER = 30.0
+    _shared_down_until: Optional[float] = None
+    
+    @staticmethod
+    def shared_backend() -> Optional[CacheBackend]:
+        """Return the shared backend unless it failed recently"""
+        down_until = TTLCache._shared_down_until
+        if down_until is not None and time.monotonic() < down_until:
+            return None
+        return TTLCache.shared
+    
+    @staticmethod
+    def shared_failed(e: Exception):
+        """Stop using the shared backend for SHARED_RETRY_AFTER seconds, logging once"""
+        if TTLCache._shared_down_until is None:
+            logger.warning(f"Shared cache unavailable, using local caches for {TTLCache.SHARED_RETRY_AFTER:.0f}s: {e}")
+        TTLCache._shared_down_until = time.monotonic() + TTLCache.SHARED_RETRY_AFTER
+    
+    @staticmethod
+    def shared_recovered():
+        if TTLCache._shared_down_until is not None:
+            TTLCache._shared_down_until = None
+            logger.info("Shared cache reachable again")
+    
+    def __init__(self, ttl: float, max_size: int = 10000, namespace: str = ''):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.namespace = namespace
+        self._entries: 'OrderedDict[str, Tuple[float, object]]' = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+    
+    def get(self, key: str) -> Optional[object]:
+        """Return a fresh cached value or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def clear(self):
+        """Drop all local entries and reset the hit counters"""
+        self._entries.clear()
+        self._inflight.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def set(self, key: str, value: object, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entries when full"""
+        self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable]) -> object:
+        """Return the cached value or run fetch once, sharing it with concurrent callers
+        
+        None results are not cached so failures are retried next time.
+        """
+        # Only live (traced) lookups count, so prefetching doesn't inflate the hit rate
+        live = RequestTrace.current() is not None
+        
+        value = self.get(key)
+        if value is not None:
+            self.hits += live
+            return value
+        
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += live
+            return await asyncio.shield(inflight)
+        
+        self.misses += live
+        future = asyncio.ensure_future(self.fetch_shared(key, fetch))
+        self._inflight[key] = future
+        try:
+            value = await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._inflight.pop(key, None)
+            else:
+                future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        if value is not None:
+            self.set(key, value)
+        return value
+    
+    async def fetch_shared(self, key: str, fetch: Callable[[], Awaitable]) -> object:
+        """Read through the shared backend, fetching under a cross-instance lock"""
+        backend = TTLCache.shared_backend()
+        if backend is None or not self.namespace:
+            return await fetch()
+        
+        shared_key = f"{self.namespace}:{key}"
+        lock_key = f"lock:{shared_key}"
+        owner = uuid.uuid4().hex
+        acquired = False
+        try:
+            value = await asyncio.to_thread(backend.get, shared_key)
+            TTLCache.shared_recovered()
+            if value is not None:
+                return json.loads(value)
+            
+            # Wait for another instance's fetch instead of repeating it
+            deadline = time.monotonic() + self.LOCK_WAIT
+            while True:
+                acquired = await asyncio.to_thread(backend.acquire, lock_key, owner, self.LOCK_TTL)
+                if acquired or time.monotonic() >= deadline:
+                    break
+                await asyncio.sleep(self.LOCK_POLL_INTERVAL)
+                value = await asyncio.to_thread(backend.get, shared_key)
+                if value is not None:
+                    return json.loads(value)
+        except Exception as e:
+            TTLCache.shared_failed(e)
+            backend = None
+        
+        try:
+            value = await fetch()
+            if value is not None and backend is not None:
+                try:
+                    await asyncio.to_thread(backend.set, shared_key, json.dumps(value), self.ttl)
+                except Exception as e:
+                    TTLCache.shared_failed(e)
+            return value
+        finally:
+            if acquired:
+                try:
+                    await asyncio.to_thread(backend.release, lock_key, owner)
+                except Exception as e:
+                    TTLCache.shared_failed(e)
+
+class Warmup:
+    """Load heavy dependencies and open connections before handling updates"""
+
+    # Max seconds to hold back polling; the rest continues in the background
+    TIMEOUT = 10.0
+
+    @staticmethod
+    def run() -> Dict[str, float]:
+        """Run all warm-up steps, returns seconds spent per step"""
+        timings = {}
+
+        start = time.perf_counter()
+        import requests  # noqa: F401
+        from bs4 import BeautifulSoup
+        BeautifulSoup('<html><title>warmup</title></html>', 'html.parser').select_one('title')
+        timings['imports'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        TitleCleaner.get_matcher()
+        timings['keywords'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        UserAgentPool.build()
+        timings['user_agents'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        HTTPClient.prewarm()
+        timings['connections'] = time.perf_counter() - start
+
+        return timings
+
 class URLResolver:
     """Handle URL unshortening and cleaning"""
     
@@ -36,11 +616,17 @@ class URLResolver:
         'mc_cid', 'mc_eid', '_gl', 'igshid', 'si'
     ]
     
+    # Short URL -> cleaned final URL
+    resolution_cache = TTLCache(ttl=6 * 3600, namespace='resolve')
+    
+    URL_PATTERN = re.compile(
+        r'https?://(?:[-\w.])+(?::[0-9]+)?(?:/(?:[\w/_.\-~%])*)?(?:\?(?:[\w&=%.\-])*)?(?:#(?:[\w.\-])*)?'
+    )
+    
     @staticmethod
     def detect_links(text: str) -> List[str]:
         """Extract all URLs from text"""
-        url_pattern = r'https?://(?:[-\w.])+(?::[0-9]+)?(?:/(?:[\w/_.\-~%])*)?(?:\?(?:[\w&=%.\-])*)?(?:#(?:[\w.\-])*)?'
-        return re.findall(url_pattern, text)
+        return URLResolver.URL_PATTERN.findall(text)
     
     @staticmethod
     def is_shortener(url: str) -> bool:
@@ -52,29 +638,35 @@ class URLResolver:
     async def unshorten_url(url: str, max_redirects: int = 5) -> str:
         """Resolve shortened URL to final destination with multiple redirect handling"""
         try:
-            ua = UserAgent()
-            headers = {
-                'User-Agent': ua.random,
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
-            
-            def make_request():
-                session = requests.Session()
-                session.max_redirects = max_redirects
-                response = session.get(url, headers=headers, allow_redirects=True, timeout=8, verify=False)
-                return response.url
-            
-            final_url = await asyncio.to_thread(make_request)
-            return URLResolver.clean_url(final_url)
-            
+            return await URLResolver.resolution_cache.get_or_fetch(
+                url, lambda: URLResolver.fetch_final_url(url, max_redirects)
+            )
         except Exception as e:
             logger.warning(f"Failed to unshorten URL {url}: {e}")
             return URLResolver.clean_url(url)
     
+    @staticmethod
+    async def fetch_final_url(url: str, max_redirects: int = 5) -> str:
+        """Follow redirects over the network and return the cleaned final URL"""
+        headers = {
+            'User-Agent': UserAgentPool.random(),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1'
+        }
+        
+        await DNSCache.resolve(urlparse(url).hostname)
+        
+        def make_request():
+            session = HTTPClient.new_session(max_redirects)
+            response = session.get(url, headers=headers, allow_redirects=True, timeout=8, verify=False)
+            return response.url
+        
+        final_url = await asyncio.to_thread(make_request)
+        return URLResolver.clean_url(final_url)
+    
     @staticmethod
     def clean_url(url: str) -> str:
         """Remove tracking parameters from URL"""
@@ -100,6 +692,84 @@ class URLResolver:
         except Exception:
             return url
 
+class KeywordMatcher:
+    """Aho-Corasick automaton over word tokens for multi-word keyword lookup"""
+
+    def __init__(self):
+        # Trie transitions, failure links and (length, category, value) outputs per state;
+        # keywords holds each state's own phrases, outputs adds those reachable by failure links
+        self.transitions: List[Dict[str, int]] = [{}]
+        self.failures: List[int] = [0]
+        self.keywords: List[List[Tuple[int, str, str]]] = [[]]
+        self.outputs: List[List[Tuple[int, str, str]]] = [[]]
+        # Single-word phrases per category, e.g. to skip gender words in fallbacks.
+        # Multi-word phrases are left out so "for her" doesn't make "for" a gender word
+        self.category_terms: Dict[str, set] = {}
+        self.built = False
+
+    def add(self, phrase: str, category: str, value: Optional[str] = None):
+        """Add a keyword phrase; value defaults to the phrase itself"""
+        tokens = phrase.lower().split()
+        if not tokens:
+            return
+
+        state = 0
+        for token in tokens:
+            next_state = self.transitions[state].get(token)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions[state][token] = next_state
+                self.transitions.append({})
+                self.failures.append(0)
+                self.keywords.append([])
+                self.outputs.append([])
+            state = next_state
+
+        self.keywords[state].append((len(tokens), category, value or ' '.join(tokens)))
+        if len(tokens) == 1:
+            self.category_terms.setdefault(category, set()).add(tokens[0])
+        self.built = False
+
+    def build(self):
+        """Compute failure links and merged outputs breadth-first, safe to repeat"""
+        self.outputs = [list(keywords) for keywords in self.keywords]
+        queue = list(self.transitions[0].values())
+        for state in queue:
+            self.failures[state] = 0
+
+        for state in queue:
+            for token, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                failure = self.failures[state]
+                while failure and token not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                self.failures[next_state] = self.transitions[failure].get(token, 0)
+                self.outputs[next_state].extend(self.outputs[self.failures[next_state]])
+
+        self.built = True
+
+    def terms(self, category: str) -> set:
+        """Return the single-word phrases of a category"""
+        return self.category_terms.get(category, set())
+
+    def find_all(self, words: List[str]) -> List[Tuple[int, int, str, str]]:
+        """Return (start, end, category, value) for every match in one pass"""
+        if not self.built:
+            self.build()
+
+        matches = []
+        state = 0
+        for position, word in enumerate(words):
+            while state and word not in self.transitions[state]:
+                state = self.failures[state]
+            state = self.transitions[state].get(word, 0)
+            for length, category, value in self.outputs[state]:
+                matches.append((position - length + 1, position + 1, category, value))
+
+        # Leftmost first, longest first at the same start
+        matches.sort(key=lambda match: (match[0], -match[1]))
+        return matches
+
 class TitleCleaner:
     """Extract and clean product titles with advanced fallback strategies"""
     
@@ -128,6 +798,25 @@ class TitleCleaner:
         'unisex': ['unisex', 'couple']
     }
     
+    KNOWN_BRANDS = [
+        'nike', 'adidas', 'puma', 'reebok', 'boat', 'jbl', 'sony', 
+        'samsung', 'apple', 'mi', 'realme', 'oneplus', 'vivo', 'oppo',
+        'libas', 'aurelia', 'w', 'biba', 'global desi', 'chemistry',
+        'aqualogica', 'dove', 'lakme', 'maybelline', 'loreal', 'nivea'
+    ]
+    
+    PRODUCT_KEYWORDS = CLOTHING_KEYWORDS + [
+        'watch', 'phone', 'earphones', 'headphones', 'speaker',
+        'charger', 'cable', 'powerbank', 'case', 'cover'
+    ]
+    
+    # Optional JSON file extending the vocabularies:
+    # {"brands": [...], "products": [...], "gender": {"women": [...], ...}}
+    KEYWORDS_FILE = os.getenv('KEYWORDS_FILE', '')
+    
+    _matcher: Optional[KeywordMatcher] = None
+    _matcher_lock = threading.Lock()
+    
     QUANTITY_PATTERNS = [
         r'pack of (\d+)', r'set of (\d+)', r'(\d+)\s*pcs?', r'(\d+)\s*pieces?',
         r'(\d+)\s*units?', r'(\d+)\s*kg', r'(\d+)\s*g\b', r'(\d+)\s*ml',
@@ -135,6 +824,57 @@ class TitleCleaner:
         r'multipack\s*(\d+)', r'(\d+)\s*in\s*1'
     ]
     
+    # Compiled once at import so per-title cleaning does no regex compilation
+    FLUFF_REGEXES = [
+        re.compile(r'\b' + re.escape(fluff) + r'\b', re.IGNORECASE) for fluff in FLUFF_WORDS
+    ]
+    QUANTITY_REGEXES = [
+        (pattern, re.compile(pattern, re.IGNORECASE)) for pattern in QUANTITY_PATTERNS
+    ]
+    
+    # Final URL -> scraped page title
+    title_cache = TTLCache(ttl=6 * 3600, namespace='title')
+    
+    @staticmethod
+    def get_matcher() -> KeywordMatcher:
+        """Build the brand/product/gender matcher once and reuse it"""
+        if TitleCleaner._matcher is None:
+            with TitleCleaner._matcher_lock:
+                if TitleCleaner._matcher is None:
+                    TitleCleaner._matcher = TitleCleaner.build_matcher(TitleCleaner.KEYWORDS_FILE)
+        return TitleCleaner._matcher
+    
+    @staticmethod
+    def build_matcher(keywords_file: str = '') -> KeywordMatcher:
+        """Build a matcher from the built-in lists plus an optional data file"""
+        brands = list(TitleCleaner.KNOWN_BRANDS)
+        products = list(TitleCleaner.PRODUCT_KEYWORDS)
+        gender = {name: list(keywords) for name, keywords in TitleCleaner.GENDER_KEYWORDS.items()}
+        
+        if keywords_file:
+            try:
+                with open(keywords_file, encoding='utf-8') as f:
+                    data = json.load(f)
+                brands.extend(data.get('brands', []))
+                products.extend(data.get('products', []))
+                for name, keywords in data.get('gender', {}).items():
+                    gender.setdefault(name, []).extend(keywords)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to load keywords from {keywords_file}: {e}")
+        
+        matcher = KeywordMatcher()
+        for brand in brands:
+            matcher.add(brand, 'brand')
+        for product in products:
+            matcher.add(product, 'product')
+        for name, keywords in gender.items():
+            for keyword in keywords:
+                matcher.add(keyword, 'gender', name)
+        matcher.build()
+        
+        logger.info(f"Keyword matcher built: {len(brands)} brands, {len(products)} products")
+        return matcher
+    
     @staticmethod
     async def extract_title_with_fallback(url: str, message_text: str) -> str:
         """Extract title using multiple fallback strategies"""
@@ -239,11 +979,17 @@ class TitleCleaner:
     
     @staticmethod
     async def extract_title_from_url_enhanced(url: str) -> Optional[str]:
+        """Scraped page title, served from cache when the URL was seen recently"""
+        return await TitleCleaner.title_cache.get_or_fetch(
+            url, lambda: TitleCleaner.scrape_title_from_url(url)
+        )
+    
+    @staticmethod
+    async def scrape_title_from_url(url: str) -> Optional[str]:
         """Enhanced title extraction with multiple user agents and methods"""
+        import requests
+        
         try:
-            # Use fake_useragent for better rotation
-            ua = UserAgent()
-            
             # Domain-specific handling
             domain = urlparse(url).netloc.lower()
             
@@ -251,7 +997,7 @@ class TitleCleaner:
             if any(site in domain for site in ['meesho', 'myntra', 'ajio']):
                 user_agent = 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1'
             else:
-                user_agent = ua.random
+                user_agent = UserAgentPool.random()
             
             headers = {
                 'User-Agent': user_agent,
@@ -273,24 +1019,35 @@ class TitleCleaner:
                 headers['Referer'] = 'https://www.google.com/'
             
             def scrape_title():
-                session = requests.Session()
+                from bs4 import BeautifulSoup
+                
+                session = HTTPClient.new_session()
                 session.headers.update(headers)
                 
                 # Add small random delay
-                time.sleep(random.uniform(0.5, 1.5))
+                with RequestTrace.stage('delay'):
+                    time.sleep(random.uniform(0.5, 1.5))
                 
                 # Disable SSL verification for problematic sites
-                response = session.get(url, timeout=8, allow_redirects=True, verify=False)
+                with RequestTrace.stage('fetch'):
+                    response = session.get(url, timeout=8, allow_redirects=True, verify=False)
+                
+                trace = RequestTrace.current()
+                if trace is not None:
+                    trace.body_size = len(response.content)
                 
                 # Check status code
                 if response.status_code != 200:
                     logger.warning(f"Got status {response.status_code} for {url}")
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                with RequestTrace.stage('parse'):
+                    soup = BeautifulSoup(response.content, 'html.parser')
                 
                 # Enhanced title extraction with domain-specific selectors
                 title_candidates = []
                 
+                select_start = time.perf_counter()
+                
                 # Universal meta tags
                 for meta_prop in ['og:title', 'twitter:title', 'title']:
                     meta_tag = soup.find('meta', attrs={'property': meta_prop}) or \
@@ -357,6 +1114,8 @@ class TitleCleaner:
                     except:
                         continue
                 
+                RequestTrace.record('select', time.perf_counter() - select_start)
+                
                 # Clean and return best candidate
                 valid_titles = []
                 for title in title_candidates:
@@ -371,6 +1130,7 @@ class TitleCleaner:
                 
                 return None
             
+            await DNSCache.resolve(urlparse(url).hostname)
             return await asyncio.to_thread(scrape_title)
             
         except requests.exceptions.RequestException as e:
@@ -394,8 +1154,8 @@ class TitleCleaner:
         title = re.sub(r'[^\w\s\-&().,]', ' ', title)
         
         # Remove fluff words
-        for fluff in TitleCleaner.FLUFF_WORDS:
-            title = re.sub(r'\b' + re.escape(fluff) + r'\b', '', title, flags=re.IGNORECASE)
+        for fluff_regex in TitleCleaner.FLUFF_REGEXES:
+            title = fluff_regex.sub('', title)
         
         # Normalize whitespace
         title = ' '.join(title.split())
@@ -412,11 +1172,14 @@ class TitleCleaner:
         """Format title according to: [Gender] [Quantity] [Brand] [Product]"""
         words = title.lower().split()
         
+        # Single pass over the title for all brand/product/gender keywords
+        matches = TitleCleaner.get_matcher().find_all(words)
+        
         # Extract components
-        gender = TitleCleaner.extract_gender(words)
+        gender = TitleCleaner.extract_gender(words, matches)
         quantity = TitleCleaner.extract_quantity(' '.join(words))
-        brand = TitleCleaner.extract_brand(words)
-        product = TitleCleaner.extract_product(words)
+        brand = TitleCleaner.extract_brand(words, matches)
+        product = TitleCleaner.extract_product(words, matches)
         
         # Build final title
         parts = []
@@ -448,18 +1211,25 @@ class TitleCleaner:
         return ' '.join(unique_parts)
     
     @staticmethod
-    def extract_gender(words: List[str]) -> Optional[str]:
+    def extract_gender(words: List[str], matches: Optional[List[Tuple[int, int, str, str]]] = None) -> Optional[str]:
         """Extract gender from words"""
-        for gender, keywords in TitleCleaner.GENDER_KEYWORDS.items():
-            if any(keyword in words for keyword in keywords):
-                return gender.title()
-        return None
+        if matches is None:
+            matches = TitleCleaner.get_matcher().find_all(words)
+        
+        found = {value for _, _, category, value in matches if category == 'gender'}
+        if not found:
+            return None
+        
+        # Built-in genders keep their priority order, file-only ones come after
+        order = list(TitleCleaner.GENDER_KEYWORDS)
+        gender = min(found, key=lambda name: order.index(name) if name in order else len(order))
+        return gender.title()
     
     @staticmethod
     def extract_quantity(text: str) -> Optional[str]:
         """Extract quantity information"""
-        for pattern in TitleCleaner.QUANTITY_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern, regex in TitleCleaner.QUANTITY_REGEXES:
+            match = regex.search(text)
             if match:
                 quantity = match.group(1) if match.groups() else match.group(0)
                 
@@ -490,24 +1260,20 @@ class TitleCleaner:
         return None
     
     @staticmethod
-    def extract_brand(words: List[str]) -> Optional[str]:
+    def extract_brand(words: List[str], matches: Optional[List[Tuple[int, int, str, str]]] = None) -> Optional[str]:
         """Extract brand name (usually first meaningful word)"""
-        # Extended brand list
-        known_brands = [
-            'nike', 'adidas', 'puma', 'reebok', 'boat', 'jbl', 'sony', 
-            'samsung', 'apple', 'mi', 'realme', 'oneplus', 'vivo', 'oppo',
-            'libas', 'aurelia', 'w', 'biba', 'global desi', 'chemistry',
-            'aqualogica', 'dove', 'lakme', 'maybelline', 'loreal', 'nivea'
-        ]
+        if matches is None:
+            matches = TitleCleaner.get_matcher().find_all(words)
         
-        # Look for known brands first
-        for word in words:
-            if word in known_brands:
-                return word.title()
+        # Look for known brands first, including multi-word ones
+        for _, _, category, value in matches:
+            if category == 'brand':
+                return value.title()
         
         # If no known brand, take first meaningful word (not gender/quantity)
+        gender_terms = TitleCleaner.get_matcher().terms('gender')
         for word in words:
-            if (word not in [kw for kw_list in TitleCleaner.GENDER_KEYWORDS.values() for kw in kw_list] 
+            if (word not in gender_terms 
                 and not re.match(r'\d+', word) 
                 and len(word) > 2):
                 return word.title()
@@ -515,27 +1281,25 @@ class TitleCleaner:
         return None
     
     @staticmethod
-    def extract_product(words: List[str]) -> str:
+    def extract_product(words: List[str], matches: Optional[List[Tuple[int, int, str, str]]] = None) -> str:
         """Extract product name (clothing items or main product)"""
-        # Extended product keywords
-        product_keywords = TitleCleaner.CLOTHING_KEYWORDS + [
-            'watch', 'phone', 'earphones', 'headphones', 'speaker',
-            'charger', 'cable', 'powerbank', 'case', 'cover'
-        ]
+        if matches is None:
+            matches = TitleCleaner.get_matcher().find_all(words)
         
         # Find product keywords
-        for word in words:
-            if word in product_keywords:
-                return word.title()
+        for _, _, category, value in matches:
+            if category == 'product':
+                return value.title()
         
         # If not found, extract meaningful product words
         product_words = []
         skip_words = ['for', 'with', 'and', 'or', 'the', 'a', 'an', 'in', 'on', 'at']
+        gender_terms = TitleCleaner.get_matcher().terms('gender')
         
         for word in words:
             if (len(word) > 2 
                 and word not in skip_words
-                and word not in [kw for kw_list in TitleCleaner.GENDER_KEYWORDS.values() for kw in kw_list]
+                and word not in gender_terms
                 and not re.match(r'\d+', word)):
                 product_words.append(word)
         
@@ -649,15 +1413,361 @@ class ResponseBuilder:
         
         return response
 
+class RequestTrace:
+    """Per-URL stage timings, shared with worker threads through a context variable"""
+    
+    # process_url calls slower than this many seconds are logged with their breakdown
+    SLOW_THRESHOLD = float(os.getenv('SLOW_REQUEST_THRESHOLD', '3.0'))
+    
+    _current: contextvars.ContextVar = contextvars.ContextVar('request_trace', default=None)
+    
+    def __init__(self, url: str):
+        self.url = url
+        self.domain = urlparse(url).netloc.lower()
+        self.body_size = 0
+        self.stages: Dict[str, float] = {}
+        self.started_at = time.perf_counter()
+    
+    @staticmethod
+    def current() -> Optional['RequestTrace']:
+        """Return the trace of the URL being processed, if any"""
+        return RequestTrace._current.get()
+    
+    def activate(self) -> contextvars.Token:
+        """Make this the current trace; asyncio.to_thread copies it into workers"""
+        return RequestTrace._current.set(self)
+    
+    def deactivate(self, token: contextvars.Token):
+        """Restore the previous trace"""
+        RequestTrace._current.reset(token)
+    
+    @staticmethod
+    def record(name: str, seconds: float):
+        """Add time to a stage of the current trace"""
+        trace = RequestTrace.current()
+        if trace is not None:
+            trace.stages[name] = trace.stages.get(name, 0.0) + seconds
+    
+    @staticmethod
+    @contextmanager
+    def stage(name: str):
+        """Time a block and add it to the current trace under the given stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            RequestTrace.record(name, time.perf_counter() - start)
+    
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+    
+    def log_if_slow(self):
+        """Log the full stage breakdown when the request was over the threshold"""
+        elapsed = self.elapsed
+        if elapsed < RequestTrace.SLOW_THRESHOLD:
+            return
+        stages = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in self.stages.items())
+        logger.warning(
+            f"Slow request {elapsed:.2f}s domain={self.domain} body={self.body_size}B "
+            f"stages=[{stages}] url={self.url}"
+        )
+
+class SamplingProfiler:
+    """Timed sampling profiler writing collapsed stacks for flamegraph tools"""
+    
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+    DEFAULT_DURATION = 30.0
+    MAX_DURATION = 300.0
+    INTERVAL = 0.005
+    
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def is_running() -> bool:
+        return SamplingProfiler._lock.locked()
+    
+    @staticmethod
+    def run(duration: float = DEFAULT_DURATION, interval: float = INTERVAL) -> Optional[str]:
+        """Sample every thread's stack for `duration` seconds, returns output path"""
+        if not SamplingProfiler._lock.acquire(blocking=False):
+            return None
+        try:
+            duration = SamplingProfiler.clamp_duration(duration)
+            own_ident = threading.get_ident()
+            stacks: Dict[str, int] = {}
+            
+            deadline = time.monotonic() + duration
+            while time.monotonic() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_ident:
+                        continue
+                    stack = SamplingProfiler.collapse(names.get(ident, str(ident)), frame)
+                    stacks[stack] = stacks.get(stack, 0) + 1
+                time.sleep(interval)
+            
+            os.makedirs(SamplingProfiler.PROFILE_DIR, exist_ok=True)
+            path = os.path.join(
+                SamplingProfiler.PROFILE_DIR,
+                f"profile-{time.strftime('%Y%m%d-%H%M%S')}.folded"
+            )
+            with open(path, 'w', encoding='utf-8') as f:
+                for stack, count in sorted(stacks.items()):
+                    f.write(f"{stack} {count}\n")
+            
+            logger.info(f"Wrote {sum(stacks.values())} samples over {duration:.0f}s to {path}")
+            return path
+        finally:
+            SamplingProfiler._lock.release()
+    
+    @staticmethod
+    def collapse(thread_name: str, frame) -> str:
+        """Format a frame chain as 'thread;outer;...;inner' (Brendan Gregg folded format)"""
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        frames.append(thread_name)
+        return ';'.join(reversed(frames))
+    
+    @staticmethod
+    def clamp_duration(duration: float) -> float:
+        """Limit a requested profile length to 1s..MAX_DURATION, nan/inf give the default"""
+        if not math.isfinite(duration):
+            return SamplingProfiler.DEFAULT_DURATION
+        return min(max(duration, 1.0), SamplingProfiler.MAX_DURATION)
+    
+    @staticmethod
+    def start_in_background(duration: float = DEFAULT_DURATION,
+                            on_done: Optional[Callable[[Optional[str]], None]] = None) -> bool:
+        """Start a profile on a daemon thread, False if one is already running
+        
+        on_done is called from the profiler thread with the output path
+        (None if another profile won the race).
+        """
+        if SamplingProfiler.is_running():
+            return False
+        
+        def profile():
+            path = SamplingProfiler.run(duration)
+            if on_done is not None:
+                on_done(path)
+        
+        threading.Thread(target=profile, name='sampling-profiler', daemon=True).start()
+        return True
+
+class Prefetcher:
+    """Low-priority background resolver that warms caches ahead of forwards"""
+    
+    # Upstream chats whose links are prefetched instead of answered
+    SOURCE_CHAT_IDS = {
+        int(chat_id) for chat_id in os.getenv('PREFETCH_CHAT_IDS', '').split(',')
+        if chat_id.strip().lstrip('-').isdigit()
+    }
+    # Text file appended to by an external feed, one or more links per line
+    FEED_FILE = os.getenv('PREFETCH_FEED_FILE', '')
+    # Budget: at most this many prefetches per minute, one at a time
+    PER_MINUTE = int(os.getenv('PREFETCH_PER_MINUTE', '20'))
+    QUEUE_SIZE = 200
+    FEED_POLL_INTERVAL = 5.0
+    IDLE_POLL_INTERVAL = 0.5
+    STATS_INTERVAL = 600.0
+    
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self.recent = TTLCache(ttl=3600)
+        self.live_requests = 0
+        self.tasks: List[asyncio.Task] = []
+        self.prefetched = 0
+        self.dropped = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.SOURCE_CHAT_IDS or self.FEED_FILE)
+    
+    def is_source_chat(self, chat_id: int) -> bool:
+        return chat_id in self.SOURCE_CHAT_IDS
+    
+    def start(self):
+        """Start the worker and feed watcher if prefetching is configured"""
+        if not self.enabled:
+            return
+        self.tasks.append(asyncio.create_task(self.worker()))
+        if self.FEED_FILE:
+            self.tasks.append(asyncio.create_task(self.watch_feed()))
+        self.tasks.append(asyncio.create_task(self.report_stats()))
+        logger.info(
+            f"Prefetcher started: {len(self.SOURCE_CHAT_IDS)} source chats, "
+            f"feed={self.FEED_FILE or 'none'}, budget {self.PER_MINUTE}/min"
+        )
+    
+    async def stop(self):
+        """Cancel background tasks"""
+        if self.enabled:
+            self.log_stats()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks.clear()
+    
+    def submit(self, text: str) -> int:
+        """Queue new links found in text, returns how many were queued"""
+        queued = 0
+        for url in URLResolver.detect_links(text):
+            if url in self.recent:
+                continue
+            try:
+                self.queue.put_nowait(url)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                continue
+            self.recent.set(url, True)
+            queued += 1
+        return queued
+    
+    def log_stats(self):
+        """Log prefetch counts and how often live requests hit the warmed caches"""
+        resolution = URLResolver.resolution_cache
+        titles = TitleCleaner.title_cache
+        logger.info(
+            f"Prefetch stats: prefetched {self.prefetched}, dropped {self.dropped}, queued {self.queue.qsize()}; "
+            f"live cache hits: resolve {resolution.hits}/{resolution.hits + resolution.misses} "
+            f"({resolution.hit_rate:.0%}), title {titles.hits}/{titles.hits + titles.misses} ({titles.hit_rate:.0%})"
+        )
+    
+    async def report_stats(self):
+        """Log stats every STATS_INTERVAL seconds"""
+        while True:
+            await asyncio.sleep(self.STATS_INTERVAL)
+            self.log_stats()
+    
+    @contextmanager
+    def live_request(self):
+        """Mark a live request in progress so prefetching backs off"""
+        self.live_requests += 1
+        try:
+            yield
+        finally:
+            self.live_requests -= 1
+    
+    async def worker(self):
+        """Prefetch queued links one at a time, within budget and only when idle"""
+        min_interval = 60.0 / max(self.PER_MINUTE, 1)
+        while True:
+            url = await self.queue.get()
+            try:
+                while self.live_requests:
+                    await asyncio.sleep(self.IDLE_POLL_INTERVAL)
+                started = time.monotonic()
+                await self.prefetch(url)
+                self.prefetched += 1
+                await asyncio.sleep(max(0.0, min_interval - (time.monotonic() - started)))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Prefetch failed for {url}: {e}")
+            finally:
+                self.queue.task_done()
+    
+    async def prefetch(self, url: str):
+        """Fill the resolution and title caches the same way process_url reads them"""
+        if URLResolver.is_shortener(url):
+            final_url = await URLResolver.unshorten_url(url)
+        else:
+            final_url = URLResolver.clean_url(url)
+        await TitleCleaner.extract_title_from_url_enhanced(final_url)
+    
+    async def watch_feed(self):
+        """Tail the feed file and queue links from newly appended lines"""
+        try:
+            offset = os.path.getsize(self.FEED_FILE)
+        except OSError:
+            offset = 0
+        
+        def read_new_lines(start: int) -> Tuple[int, str]:
+            with open(self.FEED_FILE, 'rb') as f:
+                f.seek(start)
+                data = f.read()
+            # Leave a partially written last line for the next poll
+            complete = data[:data.rfind(b'\n') + 1]
+            return start + len(complete), complete.decode('utf-8', errors='ignore')
+        
+        while True:
+            await asyncio.sleep(self.FEED_POLL_INTERVAL)
+            try:
+                if os.path.getsize(self.FEED_FILE) < offset:
+                    offset = 0  # Truncated or rotated
+                offset, text = await asyncio.to_thread(read_new_lines, offset)
+            except OSError as e:
+                logger.debug(f"Cannot read prefetch feed {self.FEED_FILE}: {e}")
+                continue
+            if text:
+                self.submit(text)
+
 class ReviewCheckkBot:
     """Main bot class with channel support"""
     
+    # Telegram user IDs allowed to run admin commands such as /profile
+    ADMIN_USER_IDS = {
+        int(user_id) for user_id in os.getenv('ADMIN_USER_IDS', '').split(',') if user_id.strip().isdigit()
+    }
+    
+    # sqlite:///path/to/cache.db or redis://host:port/db, shared by all instances
+    SHARED_CACHE_URL = os.getenv('SHARED_CACHE_URL', '')
+    
     def __init__(self, token: str):
-        self.application = Application.builder().token(token).build()
+        TTLCache.shared = CacheBackend.from_url(self.SHARED_CACHE_URL)
+        if TTLCache.shared:
+            logger.info(f"Using shared cache {type(TTLCache.shared).__name__}")
+        self.application = (
+            Application.builder().token(token)
+            .post_init(self.post_init)
+            .post_shutdown(self.post_shutdown)
+            .build()
+        )
+        self.first_reply_logged = False
+        self.prefetcher = Prefetcher()
+        self.keepalive_task: Optional[asyncio.Task] = None
         self.setup_handlers()
+        self.setup_signals()
+    
+    async def post_init(self, application: Application):
+        """Warm up parsers and connections before polling starts"""
+        def log_timings(task: asyncio.Task):
+            if task.cancelled():
+                return
+            if task.exception():
+                logger.warning(f"Warm-up failed: {task.exception()}")
+                return
+            steps = ', '.join(f"{step} {seconds:.2f}s" for step, seconds in task.result().items())
+            logger.info(f"Warm-up finished: {steps}")
+        
+        warmup_task = asyncio.create_task(asyncio.to_thread(Warmup.run))
+        warmup_task.add_done_callback(log_timings)
+        
+        # Don't hold back updates forever if a retailer is slow to connect
+        done, _ = await asyncio.wait({warmup_task}, timeout=Warmup.TIMEOUT)
+        if not done:
+            logger.info(f"Warm-up still running after {Warmup.TIMEOUT:.0f}s, continuing in background")
+        logger.info(f"Ready to accept updates {time.monotonic() - PROCESS_START:.2f}s after start")
+        
+        self.prefetcher.start()
+        self.keepalive_task = asyncio.create_task(HTTPClient.keep_warm())
+    
+    async def post_shutdown(self, application: Application):
+        """Stop background tasks"""
+        await self.prefetcher.stop()
+        if self.keepalive_task:
+            self.keepalive_task.cancel()
+            await asyncio.gather(self.keepalive_task, return_exceptions=True)
     
     def setup_handlers(self):
         """Setup message handlers for all chat types"""
+        # Admin commands must be registered before the catch-all text handler
+        self.application.add_handler(CommandHandler('profile', self.handle_profile))
+        
         # Handle messages from all chat types including channels
         self.application.add_handler(
             MessageHandler(
@@ -666,8 +1776,48 @@ class ReviewCheckkBot:
             )
         )
     
+    def setup_signals(self):
+        """Start a sampling profile on SIGUSR1 (kill -USR1 <pid>)"""
+        if not hasattr(signal, 'SIGUSR1'):
+            return
+        
+        def on_signal(signum, frame):
+            if SamplingProfiler.start_in_background():
+                logger.info(f"SIGUSR1 received, profiling for {SamplingProfiler.DEFAULT_DURATION:.0f}s")
+        
+        signal.signal(signal.SIGUSR1, on_signal)
+    
+    async def handle_profile(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Admin-only /profile [seconds]: sample the running process to a flamegraph file"""
+        message = update.effective_message
+        user = update.effective_user
+        if not message or not user or user.id not in self.ADMIN_USER_IDS:
+            return
+        
+        try:
+            duration = float(context.args[0]) if context.args else SamplingProfiler.DEFAULT_DURATION
+        except ValueError:
+            duration = math.nan
+        if not math.isfinite(duration):
+            await message.reply_text("Usage: /profile [seconds]")
+            return
+        
+        duration = SamplingProfiler.clamp_duration(duration)
+        loop = asyncio.get_running_loop()
+        
+        def on_done(path: Optional[str]):
+            text = f"Profile written to {path}" if path else "A profile is already running"
+            asyncio.run_coroutine_threadsafe(message.reply_text(text), loop)
+        
+        # Profile in the background so updates keep flowing while we sample them
+        if not SamplingProfiler.start_in_background(duration, on_done):
+            await message.reply_text("A profile is already running")
+            return
+        await message.reply_text(f"Profiling for {duration:.0f}s...")
+    
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Main message handler for all chat types"""
+        received_at = time.monotonic()
         try:
             # Handle both regular messages and channel posts
             message = update.message or update.channel_post
@@ -692,6 +1842,11 @@ class ReviewCheckkBot:
                         await message.reply_text("No title provided")
                 return
             
+            # Upstream source chats only warm the caches, never get replies
+            if self.prefetcher.is_source_chat(message.chat.id):
+                self.prefetcher.submit(text)
+                return
+            
             # Extract and process URLs
             urls = URLResolver.detect_links(text)
             
@@ -709,6 +1864,7 @@ class ReviewCheckkBot:
             if responses:
                 final_response = '\n\n'.join(responses)
                 await message.reply_text(final_response, parse_mode=None)
+                self.log_first_reply(received_at)
             
         except Exception as e:
             logger.error(f"Error handling message: {e}")
@@ -716,6 +1872,17 @@ class ReviewCheckkBot:
             if message and message.chat.type == ChatType.PRIVATE:
                 await message.reply_text("❌ Error processing request")
     
+    def log_first_reply(self, received_at: float):
+        """Log time-to-first-reply after a restart"""
+        if self.first_reply_logged:
+            return
+        self.first_reply_logged = True
+        now = time.monotonic()
+        logger.info(
+            f"Time to first reply: {now - PROCESS_START:.2f}s since start, "
+            f"{now - received_at:.2f}s for the message"
+        )
+    
     def extract_text(self, message: Message) -> str:
         """Extract text from message or caption"""
         if message.text:
@@ -729,16 +1896,34 @@ class ReviewCheckkBot:
         return ""
     
     async def process_url(self, url: str, message_text: str) -> Optional[str]:
+        """Process a single URL, logging its stage breakdown when slow"""
+        trace = RequestTrace(url)
+        token = trace.activate()
+        try:
+            with self.prefetcher.live_request():
+                return await self.build_url_response(url, message_text)
+        finally:
+            trace.deactivate(token)
+            trace.log_if_slow()
+    
+    async def build_url_response(self, url: str, message_text: str) -> Optional[str]:
         """Process a single URL and return formatted response"""
         try:
             # Unshorten URL if needed
-            if URLResolver.is_shortener(url):
-                final_url = await URLResolver.unshorten_url(url)
-            else:
-                final_url = URLResolver.clean_url(url)
+            with RequestTrace.stage('resolve'):
+                if URLResolver.is_shortener(url):
+                    final_url = await URLResolver.unshorten_url(url)
+                else:
+                    final_url = URLResolver.clean_url(url)
+            
+            trace = RequestTrace.current()
+            if trace is not None:
+                trace.domain = urlparse(final_url).netloc.lower()
+            HTTPClient.note_host(final_url)
             
             # Extract title using enhanced multi-strategy approach
-            clean_title = await TitleCleaner.extract_title_with_fallback(final_url, message_text)
+            with RequestTrace.stage('title'):
+                clean_title = await TitleCleaner.extract_title_with_fallback(final_url, message_text)
             
             # Always provide a title, never return "Unable to extract"
             if not clean_title:
@@ -0,0 +1,611 @@
+"""Replay synthetic Telegram updates against ReviewCheckkBot to size deployments
+
+Telegram is replaced by a stub Bot that records replies, and retailer and
+shortener hosts are pinned in the bot's DNS cache to a local stub HTTP
+server, so no traffic leaves the machine. --shared-cache redis runs the
+shared cache against an in-process RESP stand-in server. Each load step offers updates at
+a fixed rate for a fixed time and reports throughput, queueing delay,
+reply latency percentiles, error/fallback rates and peak RSS. Steps start
+with cold resolution/title/DNS caches unless --warm is given.
+
+    python loadtest.py --rates 1,2,5,10 --duration 30 --concurrency 1
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import logging
+import random
+import re
+import socket
+import socketserver
+import threading
+import resource
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, List, Dict, Tuple
+
+from telegram import Bot, Update
+
+from bot import ReviewCheckkBot, DNSCache, URLResolver, TitleCleaner, TTLCache, CacheBackend, RedisCacheBackend
+
+logger = logging.getLogger('loadtest')
+
+RETAILERS = {
+    'www.amazon.in': '/dp/{id}',
+    'www.flipkart.com': '/{slug}/p/{id}',
+    'www.meesho.com': '/{slug}/p/{id}',
+    'www.myntra.com': '/{slug}/{id}/buy',
+}
+
+SHORTENERS = {
+    'amzn.to': 'www.amazon.in',
+    'fkrt.cc': 'www.flipkart.com',
+    'myntr.in': 'www.myntra.com',
+}
+
+SAMPLE_TITLES = [
+    'Libas Women Cotton Printed Kurta Set Pack of 2',
+    'Global Desi Womens Floral Maxi Dress',
+    'boAt Rockerz 450 Bluetooth Wireless Headphones',
+    'Puma Men Regular Fit Cotton Tshirt',
+    'Aqualogica Glow Dewy Sunscreen 50ml',
+    'Samsung 25W Type C Fast Charger Cable',
+    'Biba Girls Ethnic Lehenga Choli Set',
+    'Nivea Men Deep Impact Shower Gel 250ml Combo of 3',
+    # No product, brand or gender keyword, so the bot has to fall back
+    'Stainless Steel Insulated Water Bottle 1 Litre',
+    'Prestige Omega Deluxe Granite Kadai 24cm',
+    'Borosil Glass Lunch Box 3 Containers',
+    'Camlin Kokuyo Oil Pastels 50 Shades',
+]
+
+# Pages that only carry junk, or no title at all (None), like error and bot-check pages
+JUNK_TITLES = ['xkcdqwrtz', '!!!!!', '404 Not Found', None]
+
+PAGE_TITLES = SAMPLE_TITLES + JUNK_TITLES
+
+FALLBACK_TITLES = {'Product', 'Meesho Product', 'Flipkart Product', 'Amazon Product', 'Myntra Fashion'}
+
+# Update being handled by the current task, so stub replies can be attributed
+current_update: contextvars.ContextVar = contextvars.ContextVar('current_update', default=None)
+
+class UpdateRecord:
+    """Timings and outcome of one synthetic update"""
+
+    def __init__(self, update_id: int, links: int):
+        self.update_id = update_id
+        self.links = links
+        self.enqueued_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.replied_at: Optional[float] = None
+        self.reply_text = ''
+        self.errors = 0
+
+class StubRetailerHandler(BaseHTTPRequestHandler):
+    """Product pages for retailer hosts and redirects for shortener hosts"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency)
+        host = self.headers.get('Host', '').split(':')[0]
+
+        if host in SHORTENERS:
+            target = SHORTENERS[host]
+            product_id = self.path.rsplit('/', 1)[-1]
+            self.send_response(302)
+            self.send_header('Location', f"http://{target}:{server.server_port}{product_page_path(target, product_id)}")
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        product_id = next((part for part in self.path.split('/') if part.startswith('B0')), 'B000000000')
+        title = page_title(product_id)
+        filler = '<div class="row"><span>filler</span></div>' * (server.page_kb * 1024 // 42)
+        if title is None:
+            body = f'<html><head></head><body>{filler}</body></html>'.encode('utf-8')
+        else:
+            body = (
+                f'<html><head><title>{title} | {host}</title>'
+                f'<meta property="og:title" content="{title}"></head>'
+                f'<body><h1>{title}</h1>{filler}</body></html>'
+            ).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+class StubRetailerServer(ThreadingHTTPServer):
+    """Local stand-in for retailer and shortener hosts"""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float, page_kb: int):
+        super().__init__(('127.0.0.1', 0), StubRetailerHandler)
+        self.latency = latency
+        self.page_kb = page_kb
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name='stub-retailers', daemon=True).start()
+        self.pin_hosts()
+
+    def pin_hosts(self):
+        """Route every stubbed host to this server through the bot's DNS cache"""
+        for host in list(RETAILERS) + list(SHORTENERS):
+            DNSCache.store(host, [(socket.AF_INET, '127.0.0.1')], ttl=float('inf'))
+
+class StubTelegramBot(Bot):
+    """Bot whose API calls never leave the process"""
+
+    def __init__(self, latency: float):
+        super().__init__(token='123456:LOADTEST')
+        # Bot is a frozen TelegramObject, only underscore attributes may be set
+        self._latency = latency
+        self._records: Dict[int, UpdateRecord] = {}
+
+    def track(self, records: Dict[int, UpdateRecord]):
+        """Attribute replies to the given update records"""
+        self._records = records
+
+    async def send_message(self, chat_id, text, *args, **kwargs):
+        await asyncio.sleep(self._latency)
+        record = self._records.get(current_update.get())
+        if record is not None:
+            record.replied_at = time.perf_counter()
+            record.reply_text = text
+        return None
+
+class StubRedisHandler(socketserver.StreamRequestHandler):
+    """Speaks enough of RESP2/RESP3 for RedisCacheBackend: GET, SET [PX|EX] [NX], DEL and the release EVAL"""
+
+    def handle(self):
+        protocol = 2
+        while True:
+            try:
+                command = self.read_command()
+            except (ConnectionError, ValueError):
+                return
+            if command is None:
+                return
+            if command[0].upper() == b'HELLO':
+                # redis-py 5+ negotiates the protocol version first
+                protocol = int(command[1]) if len(command) > 1 else protocol
+                fields = [b'server', b'redis', b'version', b'7.0.0', b'proto', protocol]
+                header = b'%3' if protocol == 3 else b'*6'
+                reply = header + b'\r\n' + b''.join(
+                    f":{field}\r\n".encode() if isinstance(field, int) else bulk(field) for field in fields
+                )
+                self.wfile.write(reply)
+                continue
+            reply = self.server.execute(command)
+            if protocol == 3 and reply == b'$-1\r\n':
+                reply = b'_\r\n'
+            self.wfile.write(reply)
+
+    def read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            return line.split()
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+class StubRedisServer(socketserver.ThreadingTCPServer):
+    """In-process stand-in for a networked Redis, for the shared cache backend"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubRedisHandler)
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.server_address[1]}/0"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name='stub-redis', daemon=True).start()
+
+    def lookup(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry[0]
+
+    def execute(self, command: List[bytes]) -> bytes:
+        name = command[0].upper()
+        args = command[1:]
+        with self.lock:
+            if name == b'PING':
+                return b'+PONG\r\n'
+            if name in (b'CLIENT', b'SELECT'):
+                return b'+OK\r\n'
+            if name == b'GET':
+                return bulk(self.lookup(args[0]))
+            if name == b'SET':
+                key, value, options = args[0], args[1], [option.upper() for option in args[2:]]
+                if b'NX' in options and self.lookup(key) is not None:
+                    return b'$-1\r\n'
+                expires_at = None
+                if b'PX' in options:
+                    expires_at = time.monotonic() + int(options[options.index(b'PX') + 1]) / 1000
+                elif b'EX' in options:
+                    expires_at = time.monotonic() + int(options[options.index(b'EX') + 1])
+                self.data[key] = (value, expires_at)
+                return b'+OK\r\n'
+            if name == b'DEL':
+                return f":{sum(self.data.pop(key, None) is not None for key in args)}\r\n".encode()
+            if name == b'EVAL' and args[0].decode() == RedisCacheBackend.RELEASE_SCRIPT:
+                key, owner = args[2], args[3]
+                if self.lookup(key) == owner:
+                    del self.data[key]
+                    return b':1\r\n'
+                return b':0\r\n'
+        return b'-ERR unsupported command ' + name + b'\r\n'
+
+def bulk(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return b'$-1\r\n'
+    return b'$' + str(len(value)).encode() + b'\r\n' + value + b'\r\n'
+
+def check_shared_backend(backend: CacheBackend):
+    """Fail fast if a backend gets get/set or lock semantics wrong"""
+    key = f"loadtest-check:{time.time()}"
+    backend.set(key, 'value', 60)
+    checks = [
+        ('get returns stored value', backend.get(key) == 'value'),
+        ('get of missing key is None', backend.get(key + ':missing') is None),
+        ('first acquire succeeds', backend.acquire(key + ':lock', 'a', 60)),
+        ('second owner is refused', not backend.acquire(key + ':lock', 'b', 60)),
+    ]
+    backend.release(key + ':lock', 'b')
+    checks.append(('release by non-owner keeps lock', not backend.acquire(key + ':lock', 'b', 60)))
+    backend.release(key + ':lock', 'a')
+    checks.append(('release by owner frees lock', backend.acquire(key + ':lock', 'b', 60)))
+    backend.release(key + ':lock', 'b')
+
+    failed = [name for name, ok in checks if not ok]
+    if failed:
+        raise RuntimeError(f"{type(backend).__name__} failed: {', '.join(failed)}")
+    logger.info(f"{type(backend).__name__} passed {len(checks)} checks")
+
+def page_title(product_id: str) -> Optional[str]:
+    # Same product ID always maps to the same page so caches behave realistically
+    return PAGE_TITLES[int(product_id[2:]) % len(PAGE_TITLES)]
+
+def product_page_path(host: str, product_id: str) -> str:
+    words = re.findall(r'[a-z0-9]+', (page_title(product_id) or '').lower())
+    slug = '-'.join(words[:4]) or product_id.lower()
+    return RETAILERS[host].format(id=product_id, slug=slug)
+
+class UpdateFactory:
+    """Build realistic private, group, channel, forwarded and photo updates"""
+
+    SHAPES = ['private', 'group', 'channel', 'forwarded', 'photo']
+
+    def __init__(self, port: int, products: int):
+        self.port = port
+        self.products = products
+        self.next_id = 1
+
+    def link(self) -> str:
+        product_id = f"B0{random.randrange(self.products):08d}"
+        if random.random() < 0.4:
+            host = random.choice(list(SHORTENERS))
+            return f"http://{host}:{self.port}/s/{product_id}"
+        host = random.choice(list(RETAILERS))
+        return f"http://{host}:{self.port}{product_page_path(host, product_id)}"
+
+    def text(self, links: int) -> str:
+        lines = []
+        for _ in range(links):
+            if random.random() < 0.5:
+                lines.append(f"{random.choice(SAMPLE_TITLES)} @{random.randint(99, 4999)} rs")
+            lines.append(self.link())
+        if random.random() < 0.2:
+            lines.append(f"Size - {random.choice(['S', 'M', 'L', 'XL'])}\nPin - 5600{random.randint(10, 99)}")
+        return '\n'.join(lines)
+
+    def build(self, bot: Bot) -> Update:
+        update_id = self.next_id
+        self.next_id += 1
+        shape = random.choice(self.SHAPES)
+        links = random.randint(1, 10)
+        now = int(time.time())
+        user = {'id': 1000 + update_id % 50, 'is_bot': False, 'first_name': 'Load'}
+
+        message = {'message_id': update_id, 'date': now, 'from': user}
+        if shape == 'private':
+            message.update(chat={'id': user['id'], 'type': 'private'}, text=self.text(links))
+        elif shape == 'group':
+            message.update(chat={'id': -1001000, 'type': 'supergroup', 'title': 'Deals'}, text=self.text(links))
+        elif shape == 'forwarded':
+            message.update(
+                chat={'id': user['id'], 'type': 'private'}, text=self.text(links),
+                forward_origin={
+                    'type': 'channel', 'date': now - 60, 'message_id': update_id,
+                    'chat': {'id': -1002000, 'type': 'channel', 'title': 'Upstream'}
+                }
+            )
+        elif shape == 'photo':
+            message.update(
+                chat={'id': user['id'], 'type': 'private'},
+                photo=[{'file_id': 'photo', 'file_unique_id': 'photo', 'width': 320, 'height': 320}]
+            )
+            # Some photos arrive without a caption
+            if random.random() < 0.9:
+                message['caption'] = self.text(links)
+        else:
+            del message['from']
+            message.update(
+                chat={'id': -1003000, 'type': 'channel', 'title': 'Our Channel'},
+                sender_chat={'id': -1003000, 'type': 'channel', 'title': 'Our Channel'},
+                text=self.text(links)
+            )
+
+        key = 'channel_post' if shape == 'channel' else 'message'
+        return Update.de_json({'update_id': update_id, key: message}, bot)
+
+class ErrorCounter(logging.Handler):
+    """Attribute ERROR records from the bot's logger to the update being handled
+
+    handle_message and process_url swallow their exceptions, so log records
+    are the only reliable error signal.
+    """
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.records: Dict[int, UpdateRecord] = {}
+
+    def emit(self, log_record: logging.LogRecord):
+        record = self.records.get(current_update.get())
+        if record is not None:
+            record.errors += 1
+
+class MemorySampler:
+    """Track peak resident memory without tracing allocations"""
+
+    INTERVAL = 0.1
+
+    def __init__(self):
+        self.peak_kb = 0
+        self.task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def rss_kb() -> int:
+        try:
+            with open('/proc/self/status', encoding='ascii') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        # Not Linux: fall back to the lifetime peak (KB on Linux, bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    async def sample(self):
+        while True:
+            self.peak_kb = max(self.peak_kb, self.rss_kb())
+            await asyncio.sleep(self.INTERVAL)
+
+    def start(self):
+        self.peak_kb = self.rss_kb()
+        self.task = asyncio.create_task(self.sample())
+
+    async def stop(self) -> float:
+        """Stop sampling, returns the peak in MB"""
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+        self.peak_kb = max(self.peak_kb, self.rss_kb())
+        return self.peak_kb / 1024
+
+def reset_caches(step: int, retailers: StubRetailerServer):
+    """Start a step cold: no resolutions, titles or DNS answers from earlier steps"""
+    for cache in (URLResolver.resolution_cache, TitleCleaner.title_cache):
+        cache.clear()
+        if TTLCache.shared:
+            # Shared entries can't be cleared portably, so move to fresh keys
+            cache.namespace = f"{cache.namespace.split('@')[0]}@step{step}"
+    DNSCache.clear()
+    retailers.pin_hosts()
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def count_fallbacks(reply_text: str) -> int:
+    """Count response blocks whose title is a generic fallback"""
+    fallbacks = 0
+    for block in reply_text.split('\n\n'):
+        title = block.split('\n', 1)[0].rsplit(' @', 1)[0]
+        if title in FALLBACK_TITLES:
+            fallbacks += 1
+    return fallbacks
+
+async def run_step(bot: ReviewCheckkBot, telegram_bot: StubTelegramBot, factory: UpdateFactory,
+                   error_counter: ErrorCounter, rate: float, duration: float,
+                   concurrency: int) -> Dict[str, float]:
+    """Offer `rate` updates/sec for `duration` seconds and summarise the outcome"""
+    records: Dict[int, UpdateRecord] = {}
+    telegram_bot.track(records)
+    error_counter.records = records
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def worker():
+        while True:
+            update, record = await queue.get()
+            record.started_at = time.perf_counter()
+            token = current_update.set(record.update_id)
+            try:
+                await bot.handle_message(update, None)
+            except Exception as e:
+                record.errors += 1
+                logger.debug(f"Update {record.update_id} raised: {e}")
+            finally:
+                current_update.reset(token)
+                record.finished_at = time.perf_counter()
+                queue.task_done()
+
+    # Application processes updates one at a time unless concurrent_updates is set
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+
+    memory = MemorySampler()
+    memory.start()
+    started = time.perf_counter()
+    total = int(rate * duration)
+    for index in range(total):
+        await asyncio.sleep(max(0.0, started + index / rate - time.perf_counter()))
+        update = factory.build(telegram_bot)
+        message = update.effective_message
+        links = URLResolver.detect_links(message.text or message.caption or '')
+        record = UpdateRecord(update.update_id, len(links))
+        records[record.update_id] = record
+        queue.put_nowait((update, record))
+
+    await queue.join()
+    elapsed = time.perf_counter() - started
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    peak_mb = await memory.stop()
+
+    done = list(records.values())
+    replied = [r for r in done if r.replied_at is not None]
+    links = sum(r.links for r in done)
+    fallbacks = sum(count_fallbacks(r.reply_text) for r in replied)
+    errors = sum(1 for r in done if r.errors)
+    queue_delays = [r.started_at - r.enqueued_at for r in done]
+    latencies = [r.replied_at - r.enqueued_at for r in replied]
+
+    return {
+        'offered_rate': rate,
+        'updates': len(done),
+        'throughput': len(done) / elapsed if elapsed else 0.0,
+        'queue_p50': percentile(queue_delays, 50),
+        'queue_p95': percentile(queue_delays, 95),
+        'queue_max': max(queue_delays, default=0.0),
+        'reply_p50': percentile(latencies, 50),
+        'reply_p95': percentile(latencies, 95),
+        'reply_p99': percentile(latencies, 99),
+        'error_rate': errors / len(done) if done else 0.0,
+        'fallback_rate': fallbacks / links if links else 0.0,
+        'peak_rss_mb': peak_mb,
+    }
+
+def print_report(results: List[Dict[str, float]]):
+    header = (
+        f"{'rate/s':>7} {'done/s':>7} {'queue p50':>10} {'queue p95':>10} "
+        f"{'reply p50':>10} {'reply p95':>10} {'reply p99':>10} {'errors':>7} {'fallback':>9} {'peak RSS':>9}"
+    )
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(
+            f"{r['offered_rate']:>7.1f} {r['throughput']:>7.2f} {r['queue_p50']:>9.2f}s {r['queue_p95']:>9.2f}s "
+            f"{r['reply_p50']:>9.2f}s {r['reply_p95']:>9.2f}s {r['reply_p99']:>9.2f}s "
+            f"{r['error_rate']:>7.1%} {r['fallback_rate']:>9.1%} {r['peak_rss_mb']:>7.1f}MB"
+        )
+
+    # Sustained: completions kept up with the offered rate and updates did not queue up
+    sustained = [
+        r['offered_rate'] for r in results
+        if r['throughput'] >= 0.9 * r['offered_rate'] and r['queue_p95'] < 1.0
+    ]
+    if sustained:
+        print(f"\nHighest sustained rate: {max(sustained):.1f} updates/s")
+    else:
+        print("\nNo load step was sustained")
+
+async def main_async(args):
+    retailers = StubRetailerServer(args.retailer_latency / 1000, args.page_kb)
+    retailers.start()
+
+    bot = ReviewCheckkBot('123456:LOADTEST')
+
+    redis_server = None
+    if args.shared_cache == 'redis':
+        redis_server = StubRedisServer()
+        redis_server.start()
+        TTLCache.shared = CacheBackend.from_url(redis_server.url)
+    elif args.shared_cache == 'sqlite':
+        TTLCache.shared = CacheBackend.from_url(f"sqlite:///{args.sqlite_path}")
+    if TTLCache.shared:
+        check_shared_backend(TTLCache.shared)
+    telegram_bot = StubTelegramBot(args.telegram_latency / 1000)
+    factory = UpdateFactory(retailers.server_port, args.products)
+
+    error_counter = ErrorCounter()
+    logging.getLogger('bot').addHandler(error_counter)
+
+    results = []
+    try:
+        for step, rate in enumerate(args.rates):
+            if not args.warm:
+                reset_caches(step, retailers)
+            logger.info(f"Load step {rate}/s for {args.duration:.0f}s")
+            results.append(await run_step(
+                bot, telegram_bot, factory, error_counter, rate, args.duration, args.concurrency
+            ))
+    finally:
+        logging.getLogger('bot').removeHandler(error_counter)
+        retailers.shutdown()
+        if redis_server:
+            redis_server.shutdown()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rates', default='1,2,5,10',
+                        type=lambda value: [float(rate) for rate in value.split(',')],
+                        help='comma separated updates/sec for each load step')
+    parser.add_argument('--duration', type=float, default=30, help='seconds per load step')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='updates handled at once (1 = Application default)')
+    parser.add_argument('--products', type=int, default=500, help='distinct product IDs, controls cache hit rate')
+    parser.add_argument('--warm', action='store_true',
+                        help='keep caches from earlier steps instead of starting each step cold')
+    parser.add_argument('--retailer-latency', type=float, default=80, help='stub retailer response time in ms')
+    parser.add_argument('--telegram-latency', type=float, default=40, help='stub Telegram API latency in ms')
+    parser.add_argument('--page-kb', type=int, default=200, help='stub product page size in KB')
+    parser.add_argument('--shared-cache', choices=['none', 'sqlite', 'redis'], default='none',
+                        help='shared cache backend; redis uses an in-process stand-in server')
+    parser.add_argument('--sqlite-path', default='loadtest-cache.db', help='file for --shared-cache sqlite')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='also write results to this file')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    logging.getLogger('bot').setLevel(logging.ERROR)
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    asyncio.run(main_async(args))
+
+if __name__ == '__main__':
+    main()